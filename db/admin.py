@@ -5,15 +5,20 @@ from django.contrib.auth.models import Group
 from db.models import Database, Table, Column, Row, Value
 
 
-class ValueInline(nested_admin.NestedStackedInline):
+class ValueInline(nested_admin.NestedTabularInline):
     model = Value
     extra = 0
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == "column":
+            kwargs["queryset"] = Column.objects.select_related("table__database")
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
     def has_delete_permission(self, request, obj=None):
         return False
 
 
-class RowInline(nested_admin.NestedStackedInline):
+class RowInline(nested_admin.NestedTabularInline):
     model = Row
     extra = 0
     inlines = [ValueInline]
@@ -26,6 +31,9 @@ class ColumnInline(nested_admin.NestedStackedInline):
     model = Column
     extra = 0
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("table__database")
+
     def has_delete_permission(self, request, obj=None):
         return False
 
@@ -35,6 +43,9 @@ class TableInline(nested_admin.NestedStackedInline):
     inlines = [ColumnInline, RowInline]
     extra = 0
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("database")
+
     def has_delete_permission(self, request, obj=None):
         return False
 
@@ -49,12 +60,18 @@ class DatabaseAdmin(nested_admin.NestedModelAdmin):
 class TableAdmin(nested_admin.NestedModelAdmin):
     inlines = [ColumnInline, RowInline]
     search_fields = ("name",)
+    list_select_related = ("database",)
 
 
 @admin.register(Value)
 class TableAdmin(admin.ModelAdmin):
     search_fields = ("info",)
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == "column":
+            kwargs["queryset"] = Column.objects.select_related("table__database")
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
 
 admin.site.unregister(Group)
 admin.site.index_title = "Front-end"
@@ -0,0 +1,50 @@
+# Generated by Django 4.1.2 on 2026-10-15 17:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0003_alter_value_row_alter_value_unique_together"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="column",
+            name="table",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="columns",
+                to="db.table",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="row",
+            name="table",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="rows",
+                to="db.table",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="table",
+            name="database",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tables",
+                to="db.database",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="value",
+            name="column",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="values",
+                to="db.column",
+            ),
+        ),
+    ]
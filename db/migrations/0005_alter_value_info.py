@@ -0,0 +1,19 @@
+# Generated by Django 4.1.2 on 2026-10-15 17:47
+
+import db.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0004_alter_column_table_alter_row_table_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="value",
+            name="info",
+            field=models.JSONField(validators=[db.models.validate_value_info]),
+        ),
+    ]
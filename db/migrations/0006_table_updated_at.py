@@ -0,0 +1,18 @@
+# Generated by Django 4.1.2 on 2026-10-15 17:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0005_alter_value_info"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="table",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.2 on 2026-10-15 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0006_table_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="database",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
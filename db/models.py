@@ -1,13 +1,19 @@
 import re
+from collections.abc import Hashable
 from enum import Enum
-from typing import Any
+from functools import cached_property
+from typing import Any, Iterable, List, Optional, Tuple
 
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
 
 
 class Database(models.Model):
     name = models.CharField(max_length=250, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return self.name
@@ -18,6 +24,7 @@ class Table(models.Model):
     database = models.ForeignKey(
         Database, on_delete=models.CASCADE, related_name="tables"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("name", "database")
@@ -37,37 +44,42 @@ class Column(models.Model):
 
         @classmethod
         def has_value(cls, value: str) -> bool:
-            return value in cls._value2member_map_
+            return value in cls._values
 
         @classmethod
         def validate(cls, column_type: str, value: Any) -> None:
-            validation_error_message = (
-                f"Incorrect value '{value}' for type '{column_type}' provided!"
-            )
-            email_regex = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-            if (
-                (
-                    column_type == Column.ColumnTypes.INT.value
-                    and not isinstance(value, int)
-                )
-                or (
-                    column_type == Column.ColumnTypes.REAL.value
-                    and not isinstance(value, float)
-                )
-                or (
-                    column_type == Column.ColumnTypes.CHAR.value
-                    and not (isinstance(value, str) and len(value) == 1)
+            check = _VALIDATORS.get(column_type)
+            if check is None or not check(value):
+                raise ValidationError(
+                    f"Incorrect value '{value}' for type '{column_type}' provided!"
                 )
-                or (
-                    column_type == Column.ColumnTypes.STRING.value
-                    and not isinstance(value, str)
-                )
-                or (
-                    column_type == Column.ColumnTypes.EMAIL.value
-                    and not bool(re.fullmatch(email_regex, value))
+
+        @classmethod
+        def validate_many(cls, column_type: str, values: Iterable[Any]) -> None:
+            check = _VALIDATORS.get(column_type)
+            for value in values:
+                if check is None or not check(value):
+                    raise ValidationError(
+                        f"Incorrect value '{value}' for type '{column_type}' provided!"
+                    )
+
+        @classmethod
+        def validate_available_values(
+            cls, column_type: str, available_values: List[Any]
+        ) -> None:
+            if not isinstance(available_values, list) or not available_values:
+                raise ValidationError("'available_values' must be a non-empty list!")
+
+            try:
+                unique_values = list(dict.fromkeys(available_values))
+            except TypeError:
+                unique_values = None
+            if unique_values is None or len(unique_values) != len(available_values):
+                raise ValidationError(
+                    "Values in 'available_values' must be unique scalars!"
                 )
-            ):
-                raise ValidationError(validation_error_message)
+
+            cls.validate_many(column_type, unique_values)
 
     COLUMN_DEFAULTS = {
         ColumnTypes.INT.value: 0,
@@ -81,11 +93,20 @@ class Column(models.Model):
     info = models.JSONField()
     table = models.ForeignKey(Table, on_delete=models.CASCADE, related_name="columns")
 
+    @cached_property
+    def _spec(self) -> Tuple[str, Optional[frozenset]]:
+        column_type = self.info["type"]
+        if column_type != Column.ColumnTypes.ENUM.value:
+            return column_type, None
+
+        return column_type, frozenset(self.info["available_values"])
+
     def validate_value(self, value: Any) -> None:
-        if self.info["type"] != "enum":
-            return Column.ColumnTypes.validate(self.info["type"], value)
+        column_type, available_values = self._spec
+        if available_values is None:
+            return Column.ColumnTypes.validate(column_type, value)
 
-        if value not in self.info["available_values"]:
+        if not isinstance(value, Hashable) or value not in available_values:
             raise ValidationError(
                 {
                     "value": f"Value '{value}' for enum column is not in available_values: "
@@ -122,17 +143,25 @@ class Column(models.Model):
                 f"Column type '{column_type}' is not supported for enum!"
             )
 
-        for value in available_values:
-            Column.ColumnTypes.validate(column_type, value)
+        Column.ColumnTypes.validate_available_values(column_type, available_values)
+
+        if provided_default not in available_values:
+            raise ValidationError(
+                f"Default '{provided_default}' is not in available_values!"
+            )
+
+    def _touch_table(self) -> None:
+        # bumps the version that cached table schemas are keyed on
+        Table.objects.filter(pk=self.table_id).update(updated_at=timezone.now())
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._touch_table()
 
-    def save(
-        self, force_insert=False, force_update=False, using=None, update_fields=None
-    ):
-        try:
-            self.full_clean()
-        except Exception as e:
-            raise ValidationError(e)
-        super().save(force_insert, force_update, using, update_fields)
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self._touch_table()
+        return result
 
     class Meta:
         unique_together = ("name", "table")
@@ -141,6 +170,23 @@ class Column(models.Model):
         return f"{self.name} (DB: {self.table.database.name}, Table: {self.table.name})"
 
 
+Column.ColumnTypes._values = frozenset(member.value for member in Column.ColumnTypes)
+
+_VALIDATORS = {
+    Column.ColumnTypes.INT.value: lambda value: (
+        isinstance(value, int) and not isinstance(value, bool)
+    ),
+    Column.ColumnTypes.REAL.value: lambda value: isinstance(value, float),
+    Column.ColumnTypes.CHAR.value: lambda value: (
+        isinstance(value, str) and len(value) == 1
+    ),
+    Column.ColumnTypes.STRING.value: lambda value: isinstance(value, str),
+    Column.ColumnTypes.EMAIL.value: lambda value: (
+        isinstance(value, str) and _EMAIL_RE.fullmatch(value) is not None
+    ),
+}
+
+
 class Row(models.Model):
     table = models.ForeignKey(Table, on_delete=models.CASCADE, related_name="rows")
 
@@ -148,27 +194,25 @@ class Row(models.Model):
         return str(self.id)
 
 
+def validate_value_info(info: Any) -> None:
+    if not isinstance(info, dict) or "value" not in info:
+        raise ValidationError("Info should have Value!")
+
+
 class Value(models.Model):
-    info = models.JSONField()
+    info = models.JSONField(validators=[validate_value_info])
     column = models.ForeignKey(Column, on_delete=models.CASCADE, related_name="values")
     row = models.ForeignKey(Row, on_delete=models.CASCADE, related_name="values")
 
     def clean(self):
         if self.column_id is None:
             raise ValidationError("You must specify column!")
-        if "value" not in self.info:
-            raise ValidationError("Info should have Value!")
 
-        self.column.validate_value(self.info["value"])
+        # a malformed info is already reported by its field validator
+        if not isinstance(self.info, dict) or "value" not in self.info:
+            return
 
-    def save(
-        self, force_insert=False, force_update=False, using=None, update_fields=None
-    ):
-        try:
-            self.full_clean()
-        except Exception as e:
-            raise ValidationError(e)
-        super(Value, self).save(force_insert, force_update, using, update_fields)
+        self.column.validate_value(self.info["value"])
 
     class Meta:
         unique_together = ("column", "row")
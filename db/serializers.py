@@ -1,3 +1,9 @@
+import copy
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable
+
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
@@ -6,14 +12,32 @@ from rest_framework_nested.serializers import NestedHyperlinkedModelSerializer
 from db.models import Database, Table, Column, Row, Value
 
 
-class TableSerializer(serializers.ModelSerializer):
+# builds the declared and model-derived fields once per serializer class
+# and gives every instance its own deep copy of them; nested serializers
+# build their url field from per-instance parent_lookup_kwargs, so those
+# are part of the key
+class CachedFieldsMixin:
+    _fields_cache: Dict[Hashable, Dict[str, serializers.Field]] = {}
+
+    def get_fields(self) -> Dict[str, serializers.Field]:
+        key = (
+            type(self),
+            frozenset(getattr(self, "parent_lookup_kwargs", {}).items()),
+        )
+        if key not in self._fields_cache:
+            self._fields_cache[key] = super().get_fields()
+
+        return copy.deepcopy(self._fields_cache[key])
+
+
+class TableSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Table
         fields = ("id", "database", "name")
         read_only_fields = ("id", "database")
 
 
-class DatabaseTableSerializers(NestedHyperlinkedModelSerializer):
+class DatabaseTableSerializers(CachedFieldsMixin, NestedHyperlinkedModelSerializer):
     parent_lookup_kwargs = {
         "database_pk": "database__pk",
     }
@@ -23,13 +47,13 @@ class DatabaseTableSerializers(NestedHyperlinkedModelSerializer):
         fields = ("url", "name")
 
 
-class DatabaseSerializer(serializers.ModelSerializer):
+class DatabaseSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Database
         fields = ("id", "name")
 
 
-class DatabaseListSerializer(serializers.HyperlinkedModelSerializer):
+class DatabaseListSerializer(CachedFieldsMixin, serializers.HyperlinkedModelSerializer):
     tables = DatabaseTableSerializers(many=True, read_only=True)
 
     class Meta:
@@ -37,68 +61,107 @@ class DatabaseListSerializer(serializers.HyperlinkedModelSerializer):
         fields = ("id", "name", "tables")
 
 
-class ColumnSerializer(serializers.ModelSerializer):
+class ColumnSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Column
         fields = ("id", "name", "info", "table")
         read_only_fields = ("id", "table")
 
 
-class ValueSerializer(serializers.ModelSerializer):
+class ValueSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    column = serializers.PrimaryKeyRelatedField(queryset=Column.objects.only("id"))
+
     class Meta:
         model = Value
         fields = ("id", "info", "column", "row")
         read_only_fields = ("row",)
 
 
-class RowSerializer(serializers.ModelSerializer):
+@lru_cache(maxsize=1024)
+def _table_schema(table_id: int, version: datetime) -> Dict[int, Callable[[Any], None]]:
+    """
+    Column id -> value validator for the table. `version` is the table's
+    `updated_at`, bumped on every column save/delete, so a changed schema
+    is never served from the cache.
+    """
+    return {
+        column.id: column.validate_value
+        for column in Column.objects.filter(table_id=table_id).only("id", "info")
+    }
+
+
+class RowSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     values = ValueSerializer(many=True, allow_empty=False)
 
     def create(self, validated_data: dict) -> Row:
+        table = Table.objects.get(id=self.context["table_id"])
+        schema = _table_schema(table.id, table.updated_at)
+        values_data = validated_data.pop("values")
+        if len(values_data) != len(schema):
+            raise ValidationError(
+                {"values": "Number of columns and values in row mismatch!"}
+            )
+        if {value_data["column"].id for value_data in values_data} != schema.keys():
+            raise ValidationError(
+                {"values": "Incorrect columns provided for this row!"}
+            )
+
+        try:
+            for value_data in values_data:
+                schema[value_data["column"].id](value_data["info"]["value"])
+        except DjangoValidationError as error:
+            raise ValidationError({"values": error.messages})
+
         with transaction.atomic():  # transaction because multiple writes - for db consistency
-            table = Table.objects.get(id=self.context["table_id"])
-            values_data = validated_data.pop("values")
-            if len(values_data) != table.columns.count():
-                raise ValidationError(
-                    {"values": "Number of columns and values in row mismatch!"}
-                )
             row = Row.objects.create(**validated_data, table=table)
-            for value_data in values_data:
-                value_data["column"].validate_value(value_data["info"]["value"])
-                Value.objects.create(row=row, **value_data)
+            Value.objects.bulk_create(
+                [
+                    Value(
+                        row=row,
+                        column=value_data["column"],
+                        info={"value": value_data["info"]["value"]},
+                    )
+                    for value_data in values_data
+                ]
+            )
 
-            return row
+        return row
 
     def update(self, instance: Row, validated_data: dict) -> Row:
-        with transaction.atomic():
-            values_data = validated_data.pop("values")
-            table = Table.objects.get(id=self.context["table_id"])
-            if len(values_data) != table.columns.count():
-                raise ValidationError(
-                    {"values": "Number of columns and values in row mismatch!"}
-                )
-
-            if table != instance.table:
-                raise ValidationError(
-                    {"table": "Table of Row cannot be change during update!"}
-                )
+        values_data = validated_data.pop("values")
+        table = Table.objects.get(id=self.context["table_id"])
+        if table.id != instance.table_id:
+            raise ValidationError(
+                {"table": "Table of Row cannot be change during update!"}
+            )
+
+        schema = _table_schema(table.id, table.updated_at)
+        existing_values = {value.column_id: value for value in instance.values.all()}
+        if len(values_data) != len(existing_values):
+            raise ValidationError(
+                {"values": "Number of columns and values in row mismatch!"}
+            )
+        provided_columns = {value_data["column"].id for value_data in values_data}
+        if provided_columns != existing_values.keys():
+            raise ValidationError(
+                {"values": "Incorrect columns provided for changing this row!"}
+            )
+
+        changed_values = []
+        for value_data in values_data:
+            value = existing_values[value_data["column"].id]
+            try:
+                schema[value.column_id](value_data["info"]["value"])
+            except DjangoValidationError as error:
+                raise ValidationError({"values": error.messages})
+
+            value.info = {"value": value_data["info"]["value"]}
+            changed_values.append(value)
 
-            for value_data in values_data:
-                if not Value.objects.filter(
-                    row=instance, column=value_data["column"]
-                ).exists():
-                    raise ValidationError(
-                        {"values": "Incorrect columns provided for changing this row!"}
-                    )
-
-                value = Value.objects.get(row=instance, column=value_data["column"])
-                value.column.validate_value(value_data["info"]["value"])
-                value.info = {"value": value_data["info"]["value"]}
-                value.save()
-
-            instance.save()
+        with transaction.atomic():
+            Value.objects.bulk_update(changed_values, ["info"])
 
-            return instance
+        return instance
 
     class Meta:
         model = Row
@@ -106,7 +169,7 @@ class RowSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "table")
 
 
-class TableColumnSerializers(NestedHyperlinkedModelSerializer):
+class TableColumnSerializers(CachedFieldsMixin, NestedHyperlinkedModelSerializer):
     parent_lookup_kwargs = {
         "table_pk": "table__pk",
         "database_pk": "table__database__pk",
@@ -117,7 +180,7 @@ class TableColumnSerializers(NestedHyperlinkedModelSerializer):
         fields = ("url", "name", "info")
 
 
-class TableRowSerializers(NestedHyperlinkedModelSerializer):
+class TableRowSerializers(CachedFieldsMixin, NestedHyperlinkedModelSerializer):
     parent_lookup_kwargs = {
         "table_pk": "table__pk",
         "database_pk": "table__database__pk",
@@ -129,7 +192,7 @@ class TableRowSerializers(NestedHyperlinkedModelSerializer):
         fields = ("url", "values")
 
 
-class TableListSerializer(serializers.HyperlinkedModelSerializer):
+class TableListSerializer(CachedFieldsMixin, serializers.HyperlinkedModelSerializer):
     columns = TableColumnSerializers(many=True, read_only=True)
     rows = TableRowSerializers(many=True, read_only=True)
 
@@ -1,3 +1,372 @@
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
 from django.test import TestCase
+from django.urls import reverse
+
+from db.models import Database, Table, Column, Row, Value
+from db.serializers import DatabaseTableSerializers
+
+
+class TableTestCase(TestCase):
+    def setUp(self) -> None:
+        self.database = Database.objects.create(name="shop")
+        self.table = Table.objects.create(name="users", database=self.database)
+        self.rows_url = self.table_url("row-list")
+
+    def table_url(self, name: str, **kwargs: Any) -> str:
+        return reverse(
+            name,
+            kwargs={
+                "database_pk": self.database.id,
+                "table_pk": self.table.id,
+                **kwargs,
+            },
+        )
+
+    def create_column(self, name: str, **info: Any) -> Column:
+        return Column.objects.create(
+            name=name, table=self.table, info=info or {"type": "int", "default": 0}
+        )
+
+    def create_row(self, *values: tuple) -> Row:
+        row = Row.objects.create(table=self.table)
+        Value.objects.bulk_create(
+            [
+                Value(row=row, column=column, info={"value": value})
+                for column, value in values
+            ]
+        )
+        return row
+
+    @staticmethod
+    def row_data(values: tuple) -> dict:
+        return {
+            "values": [
+                {"info": {"value": value}, "column": column.id}
+                for column, value in values
+            ]
+        }
+
+    def post_row(self, *values: tuple) -> HttpResponse:
+        return self.client.post(
+            self.rows_url, self.row_data(values), content_type="application/json"
+        )
+
+    def put_row(self, row_id: int, *values: tuple) -> HttpResponse:
+        return self.client.put(
+            self.table_url("row-detail", pk=row_id),
+            self.row_data(values),
+            content_type="application/json",
+        )
+
+
+class RowListQueriesTest(TableTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.column = self.create_column("code", type="string", default="")
+
+    def create_rows(self, count: int) -> None:
+        for number in range(count):
+            self.create_row((self.column, str(number)))
+
+    def test_list_queries_do_not_grow_with_rows(self) -> None:
+        for count in (1, 10):
+            self.create_rows(count)
+            with self.assertNumQueries(2):
+                response = self.client.get(self.rows_url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()), Row.objects.count())
+
+    def test_search_queries_do_not_grow_with_rows(self) -> None:
+        for count in (1, 10):
+            self.create_rows(count)
+            with self.assertNumQueries(2):
+                response = self.client.get(self.rows_url, {"search_string": "0"})
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                len(response.json()), Value.objects.filter(info__value="0").count()
+            )
+
+    def test_search_returns_matching_rows(self) -> None:
+        self.create_rows(3)
+
+        response = self.client.get(self.rows_url, {"search_string": "1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row["values"][0]["info"]["value"] for row in response.json()], ["1"]
+        )
+
+    def test_search_returns_row_once_when_several_values_match(self) -> None:
+        nickname = self.create_column("nickname", type="string", default="")
+        row = self.create_row((self.column, "bob"), (nickname, "bob"))
+
+        response = self.client.get(self.rows_url, {"search_string": "bob"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([found["id"] for found in response.json()], [row.id])
+
+
+class RowSchemaCacheTest(TableTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.column = self.create_column("age")
+
+    def test_column_change_invalidates_cached_schema(self) -> None:
+        self.assertEqual(self.post_row((self.column, 1)).status_code, 201)
+
+        self.column.info = {"type": "string", "default": ""}
+        self.column.save()
+
+        self.assertEqual(self.post_row((self.column, 1)).status_code, 400)
+        self.assertEqual(self.post_row((self.column, "1")).status_code, 201)
+
+    def test_column_create_and_delete_invalidate_cached_schema(self) -> None:
+        self.assertEqual(self.post_row((self.column, 1)).status_code, 201)
+
+        name = self.create_column("name", type="string", default="")
+        self.assertEqual(self.post_row((self.column, 1)).status_code, 400)
+        self.assertEqual(
+            self.post_row((self.column, 1), (name, "bob")).status_code, 201
+        )
+
+        name.delete()
+        self.assertEqual(
+            self.post_row((self.column, 1), (name, "bob")).status_code, 400
+        )
+        self.assertEqual(self.post_row((self.column, 1)).status_code, 201)
+
+
+class ColumnBulkCreateTest(TableTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.bulk_url = self.table_url("column-bulk")
+
+    def post_columns(self, columns: list) -> int:
+        response = self.client.post(
+            self.bulk_url, columns, content_type="application/json"
+        )
+        return response.status_code
+
+    def test_creates_all_columns(self) -> None:
+        status_code = self.post_columns(
+            [
+                {"name": "age", "info": {"type": "int"}},
+                {
+                    "name": "role",
+                    "info": {
+                        "type": "enum",
+                        "column_type": "string",
+                        "available_values": ["user", "admin"],
+                    },
+                },
+            ]
+        )
+
+        self.assertEqual(status_code, 201)
+        self.assertEqual(
+            dict(self.table.columns.values_list("name", "info")),
+            {
+                "age": {"type": "int", "default": 0},
+                "role": {
+                    "type": "enum",
+                    "default": "user",
+                    "available_values": ["user", "admin"],
+                    "column_type": "string",
+                },
+            },
+        )
+
+    def test_invalid_column_creates_nothing(self) -> None:
+        status_code = self.post_columns(
+            [
+                {"name": "age", "info": {"type": "int"}},
+                {"name": "score", "info": {"type": "int", "default": "high"}},
+            ]
+        )
+
+        self.assertEqual(status_code, 400)
+        self.assertFalse(self.table.columns.exists())
+
+    def test_rejects_duplicate_names(self) -> None:
+        self.create_column("age")
+
+        for names in (["age"], ["name", "name"]):
+            columns = [{"name": name, "info": {"type": "string"}} for name in names]
+            self.assertEqual(self.post_columns(columns), 400)
+
+        self.assertEqual(self.table.columns.count(), 1)
+
+    def test_invalidates_cached_schema(self) -> None:
+        age = self.create_column("age")
+        # a rejected row still caches the table schema
+        self.assertEqual(self.post_row((age, "old")).status_code, 400)
+
+        self.assertEqual(
+            self.post_columns([{"name": "name", "info": {"type": "string"}}]), 201
+        )
+        name = self.table.columns.get(name="name")
+
+        self.assertEqual(self.post_row((age, 1), (name, "bob")).status_code, 201)
+
+
+class ListETagTest(TableTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.databases_url = reverse("database-list")
+        self.columns_url = self.table_url("column-list")
+
+    def assertNotModified(self, url: str) -> str:
+        etag = self.client.get(url).headers["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        return etag
+
+    def assertStatus(self, url: str, etag: str, status_code: int) -> None:
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status_code)
+
+    def test_database_list_etag_follows_databases_and_tables(self) -> None:
+        changes = (
+            lambda: Database.objects.create(name="blog"),
+            lambda: Table.objects.create(name="posts", database=self.database),
+            lambda: Table.objects.filter(name="posts").get().save(),
+            lambda: Table.objects.filter(name="posts").delete(),
+            lambda: Database.objects.filter(name="blog").delete(),
+        )
+        for change in changes:
+            etag = self.assertNotModified(self.databases_url)
+            change()
+            self.assertStatus(self.databases_url, etag, 200)
+
+    def test_column_list_etag_follows_columns(self) -> None:
+        etag = self.assertNotModified(self.columns_url)
+        column = self.create_column("age")
+        self.assertStatus(self.columns_url, etag, 200)
+
+        etag = self.assertNotModified(self.columns_url)
+        column.delete()
+        self.assertStatus(self.columns_url, etag, 200)
+
+
+class RowValueValidationTest(TableTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.age = self.create_column("age")
+        self.role = self.create_column(
+            "role",
+            type="enum",
+            default="user",
+            available_values=["user"],
+            column_type="string",
+        )
+
+    def test_invalid_values_are_rejected_with_400(self) -> None:
+        for age, role in ((True, "user"), (1, "admin")):
+            response = self.post_row((self.age, age), (self.role, role))
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("values", response.json())
+
+        self.assertFalse(Row.objects.exists())
+
+    def test_update_with_invalid_value_is_rejected_with_400(self) -> None:
+        row = self.create_row((self.age, 1), (self.role, "user"))
+
+        response = self.put_row(row.id, (self.age, True), (self.role, "user"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Value.objects.get(column=self.age).info, {"value": 1})
+
+
+class EnumColumnValidationTest(TableTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.url = self.table_url("column-list")
+        self.bulk_url = self.table_url("column-bulk")
+
+    def enum_column(self, available_values: Any, **info: Any) -> dict:
+        return {
+            "name": "role",
+            "info": {
+                "type": "enum",
+                "column_type": "string",
+                "available_values": available_values,
+                **info,
+            },
+        }
+
+    def test_rejects_invalid_available_values(self) -> None:
+        for available_values in ([], 5, {"k": 1}, "ab", ["a", "a"], [["a"]]):
+            column = self.enum_column(available_values)
+            for url, data in ((self.url, column), (self.bulk_url, [column])):
+                response = self.client.post(url, data, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("data", response.json())
+
+        self.assertFalse(self.table.columns.exists())
+
+    def test_rejects_default_outside_available_values(self) -> None:
+        response = self.client.post(
+            self.url,
+            self.enum_column(["x", "y"], default="zzz"),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.table.columns.exists())
+
+    def test_accepts_default_from_available_values(self) -> None:
+        response = self.client.post(
+            self.url,
+            self.enum_column(["x", "y"], default="y"),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.table.columns.get().info["default"], "y")
+
+
+class RowUpdateColumnsTest(TableTestCase):
+    def test_rejects_repeated_column(self) -> None:
+        age = self.create_column("age")
+        score = self.create_column("score")
+        row = self.create_row((age, 1), (score, 2))
+
+        response = self.put_row(row.id, (age, 10), (age, 20))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            dict(Value.objects.values_list("column__name", "info__value")),
+            {"age": 1, "score": 2},
+        )
+
+
+class CachedFieldsTest(TestCase):
+    def test_nested_url_field_follows_parent_lookup_kwargs(self) -> None:
+        default = DatabaseTableSerializers().fields["url"]
+        custom = DatabaseTableSerializers(
+            parent_lookup_kwargs={"database_pk": "database__name"}
+        ).fields["url"]
+
+        self.assertEqual(default.parent_lookup_kwargs, {"database_pk": "database__pk"})
+        self.assertEqual(custom.parent_lookup_kwargs, {"database_pk": "database__name"})
+
+
+class ValueCleanTest(TableTestCase):
+    def test_malformed_info_is_reported_once(self) -> None:
+        value = Value(
+            row=Row.objects.create(table=self.table),
+            column=self.create_column("age"),
+            info={"other": 1},
+        )
+
+        with self.assertRaises(ValidationError) as context:
+            value.full_clean()
 
-# Create your tests here.
+        self.assertEqual(
+            context.exception.message_dict, {"info": ["Info should have Value!"]}
+        )
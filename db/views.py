@@ -1,13 +1,23 @@
-from typing import Type
-
-from django.db.models import QuerySet
+from typing import Optional, Type
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import QuerySet, Prefetch, Exists, OuterRef, Count, Max
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets, mixins
+from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.renderers import JSONRenderer, BrowsableAPIRenderer
+from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 
-from db.models import Database, Table, Column, Row
+from db.models import Database, Table, Column, Row, Value
 from db.serializers import (
     DatabaseSerializer,
     TableSerializer,
@@ -17,11 +27,49 @@ from db.serializers import (
     TableListSerializer,
 )
 
+# the browsable API renders every response a second time through HTML templates,
+# so endpoints returning whole tables of rows only offer it in DEBUG
+ROWS_RENDERER_CLASSES = (
+    [JSONRenderer, BrowsableAPIRenderer] if settings.DEBUG else [JSONRenderer]
+)
+
+
+def databases_etag(request, *args, **kwargs) -> str:
+    # counts catch deletions, max(updated_at) catches creations and renames
+    databases = Database.objects.aggregate(count=Count("id"), last=Max("updated_at"))
+    tables = Table.objects.aggregate(count=Count("id"), last=Max("updated_at"))
+    return "{}-{}-{}-{}".format(
+        databases["count"], databases["last"], tables["count"], tables["last"]
+    )
+
 
+def columns_etag(request, *args, **kwargs) -> Optional[str]:
+    # the table's updated_at is bumped on every column save/delete
+    updated_at = (
+        Table.objects.filter(pk=kwargs["table_pk"])
+        .values_list("updated_at", flat=True)
+        .first()
+    )
+    return None if updated_at is None else str(updated_at)
+
+
+@method_decorator(etag(databases_etag), name="list")
 class DatabaseViewSet(viewsets.ModelViewSet):
     queryset = Database.objects.all()
     serializer_class = DatabaseSerializer
 
+    def get_queryset(self) -> QuerySet:
+        queryset = Database.objects.all()
+
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "tables", queryset=Table.objects.only("id", "name", "database")
+                )
+            )
+
+        return queryset
+
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action in ("list", "retrieve"):
             return DatabaseListSerializer
@@ -32,9 +80,23 @@ class DatabaseViewSet(viewsets.ModelViewSet):
 class TableViewSet(viewsets.ModelViewSet):
     queryset = Table.objects.all()
     serializer_class = TableSerializer
+    renderer_classes = ROWS_RENDERER_CLASSES
+
+    def initial(self, request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        self._database_pk = int(self.kwargs["database_pk"])
 
     def get_queryset(self) -> QuerySet:
-        return Table.objects.filter(database=self.kwargs["database_pk"])
+        queryset = Table.objects.filter(database_id=self._database_pk)
+
+        if self.action in ("list", "retrieve"):
+            queryset = (
+                queryset.select_related("database")
+                .only("id", "name", "database__id")
+                .prefetch_related("columns", "rows__values")
+            )
+
+        return queryset
 
     def get_serializer_class(self) -> Type[Serializer]:
         if self.action in ("list", "retrieve"):
@@ -43,9 +105,68 @@ class TableViewSet(viewsets.ModelViewSet):
         return TableSerializer
 
     def perform_create(self, serializer: TableSerializer) -> None:
-        serializer.save(database_id=self.kwargs["database_pk"])
+        serializer.save(database_id=self._database_pk)
+
 
+class SimpleColumnValidator:
+    def __init__(self, column_type: str) -> None:
+        self.column_type = column_type
+        self.default = Column.COLUMN_DEFAULTS[column_type]
 
+    def build(self, data: dict) -> dict:
+        provided_default = data.get("default")
+        if provided_default is None:
+            provided_default = self.default
+
+        Column.ColumnTypes.validate(self.column_type, provided_default)
+        return {"type": self.column_type, "default": provided_default}
+
+
+class EnumColumnValidator:
+    def build(self, data: dict) -> dict:
+        if "available_values" not in data or "column_type" not in data:
+            raise ValidationError(
+                {
+                    "data": "If type is 'enum' - you should provide "
+                    "additionally 'column_type' and 'available_values'"
+                }
+            )
+        column_type = data["column_type"]
+        available_values = data["available_values"]
+
+        if not Column.ColumnTypes.has_value(column_type) or column_type == "enum":
+            raise ValidationError(
+                {"data": f"Column type '{column_type}' is not supported for enum!"}
+            )
+
+        Column.ColumnTypes.validate_available_values(column_type, available_values)
+
+        provided_default = data.get("default")
+        if provided_default is None:
+            provided_default = available_values[0]
+        elif provided_default not in available_values:
+            raise ValidationError(
+                {"data": f"Default '{provided_default}' is not in available_values!"}
+            )
+
+        return {
+            "type": Column.ColumnTypes.ENUM.value,
+            "default": provided_default,
+            "available_values": available_values,
+            "column_type": column_type,
+        }
+
+
+COLUMN_INFO_VALIDATORS = {
+    Column.ColumnTypes.ENUM.value: EnumColumnValidator(),
+    **{
+        column_type: SimpleColumnValidator(column_type)
+        for column_type in Column.COLUMN_DEFAULTS
+    },
+}
+
+
+@method_decorator(etag(columns_etag), name="list")
 class ColumnViewSet(
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -56,67 +177,87 @@ class ColumnViewSet(
     queryset = Column.objects.all()
     serializer_class = ColumnSerializer
 
-    def get_queryset(self) -> QuerySet:
-        return Column.objects.filter(table=self.kwargs["table_pk"])
+    def initial(self, request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        self._table_pk = int(self.kwargs["table_pk"])
 
-    def perform_create(self, serializer: ColumnSerializer):
-        new_column_data = serializer.validated_data
-        table = Table.objects.get(id=self.kwargs["table_pk"])
+    def get_queryset(self) -> QuerySet:
+        return Column.objects.filter(table_id=self._table_pk)
 
-        if Row.objects.filter(table=table).exists():
+    @staticmethod
+    def _check_table_has_no_rows(table_id: int) -> None:
+        if Row.objects.filter(table_id=table_id).exists():
             raise ValidationError(
                 {
                     "table": "You can not add columns to the Table, if there are some rows in it!"
                 }
             )
 
-        data = new_column_data["info"]
-
+    @staticmethod
+    def _build_info(data: dict) -> dict:
         provided_type = data.get("type", "no_type_provided_error")
-        provided_default = data.get("default")
+        validator = COLUMN_INFO_VALIDATORS.get(provided_type)
 
-        if not Column.ColumnTypes.has_value(provided_type):
+        if validator is None:
             raise ValidationError(
                 {"data": f"Provided type: '{provided_type}' is not supported!"}
             )
 
-        if provided_type != "enum":
-            if provided_default is None:
-                provided_default = Column.COLUMN_DEFAULTS[provided_type]
-
-            Column.ColumnTypes.validate(provided_type, provided_default)
-            return serializer.save(
-                info={"type": provided_type, "default": provided_default}
-            )
+        try:
+            return validator.build(data)
+        except DjangoValidationError as error:
+            raise ValidationError({"data": error.messages})
 
-        if "available_values" not in data or "column_type" not in data:
-            raise ValidationError(
-                {
-                    "data": "If type is 'enum' - you should provide "
-                    "additionally 'column_type' and 'available_values'"
-                }
-            )
-        column_type = data["column_type"]
-        available_values = data["available_values"]
+    def perform_create(self, serializer: ColumnSerializer):
+        table_id = self._table_pk
+        self._check_table_has_no_rows(table_id)
 
-        if provided_default is None:
-            provided_default = available_values[0]
+        return serializer.save(
+            table_id=table_id,
+            info=self._build_info(serializer.validated_data["info"]),
+        )
 
-        if not Column.ColumnTypes.has_value(column_type) or column_type == "enum":
+    @extend_schema(
+        request=ColumnSerializer(many=True),
+        responses={status.HTTP_201_CREATED: ColumnSerializer(many=True)},
+    )
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, *args, **kwargs):
+        """
+        Bulk create Columns endpoint details:
+        accepts a list of columns in the same format as the create endpoint
+        and creates all of them at once - either all columns are created or none
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        table_id = self._table_pk
+        self._check_table_has_no_rows(table_id)
+
+        names = [column_data["name"] for column_data in serializer.validated_data]
+        if (
+            len(set(names)) != len(names)
+            or Column.objects.filter(table_id=table_id, name__in=names).exists()
+        ):
             raise ValidationError(
-                {"data": f"Column type '{column_type}' is not supported for enum!"}
+                {"name": "Column names must be unique within the Table!"}
             )
 
-        for value in available_values:
-            Column.ColumnTypes.validate(column_type, value)
-
-        return serializer.save(
-            info={
-                "type": provided_type,
-                "default": provided_default,
-                "available_values": available_values,
-                "column_type": column_type,
-            }
+        columns = [
+            Column(
+                table_id=table_id,
+                name=column_data["name"],
+                info=self._build_info(column_data["info"]),
+            )
+            for column_data in serializer.validated_data
+        ]
+        with transaction.atomic():
+            Column.objects.bulk_create(columns)
+            # bulk_create skips Column.save(), so bump the table version here
+            Table.objects.filter(pk=table_id).update(updated_at=timezone.now())
+
+        return Response(
+            self.get_serializer(columns, many=True).data,
+            status=status.HTTP_201_CREATED,
         )
 
     def create(self, request, *args, **kwargs):
@@ -143,22 +284,40 @@ class ColumnViewSet(
         return super().create(request, *args, **kwargs)
 
 
+class OptionalLimitOffsetPagination(LimitOffsetPagination):
+    # without `?limit=` the endpoint returns the plain list, so the schema
+    # documents both response shapes
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {"oneOf": [schema, super().get_paginated_response_schema(schema)]}
+
+
 class RowViewSet(viewsets.ModelViewSet):
     queryset = Row.objects.all()
     serializer_class = RowSerializer
+    renderer_classes = ROWS_RENDERER_CLASSES
+    # no default limit, so rows are only paginated when `?limit=` is passed
+    pagination_class = OptionalLimitOffsetPagination
+
+    def initial(self, request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        self._table_pk = int(self.kwargs["table_pk"])
 
     def get_queryset(self) -> QuerySet:
-        queryset = self.queryset.filter(table=self.kwargs["table_pk"])
+        queryset = self.queryset.filter(table_id=self._table_pk)
 
         search_string = self.request.query_params.get("search_string", None)
 
         if search_string:
-            queryset = queryset.filter(values__info__value=search_string)
+            queryset = queryset.filter(
+                Exists(
+                    Value.objects.filter(row=OuterRef("pk"), info__value=search_string)
+                )
+            )
 
-        return queryset
+        return queryset.order_by("id").prefetch_related("values")
 
     def get_serializer_context(self) -> dict:
-        return {"table_id": self.kwargs["table_pk"]}
+        return {"table_id": self._table_pk}
 
     @extend_schema(
         parameters=[
@@ -174,6 +333,7 @@ class RowViewSet(viewsets.ModelViewSet):
         Search by `search_string` string.
         It can be searched by specific value. Only 100% match is supported!
         Example: `?search_string=user`
+        Paginate with `limit` and `offset` (ex. ?limit=50&offset=100)
         """
         return super().list(request, *args, **kwargs)
 